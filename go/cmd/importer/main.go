@@ -6,9 +6,8 @@ import (
 	"flag"
 	"fmt"
 	"log"
-	"os"
-	"path/filepath"
 	"strings"
+	"sync"
 	"time"
 
 	_ "github.com/jackc/pgx/v5/stdlib"
@@ -35,24 +34,46 @@ func main() {
 	conn := sqlx.NewSqlConn("pgx", dsn)
 	logx.Infof("connecting to %s", dsn)
 
+	// Use existing DataLoader to parse JSON
+	dl := data.NewDataLoader(dataPath)
+	// Decode the files the import reads in parallel; the sections below are
+	// then served from the loader cache.
+	prefetch(
+		func() { _, _ = dl.LoadCryptoPrices() },
+		func() { _, _ = dl.LoadSinceInception() },
+		func() { _, _ = dl.LoadTrades() },
+		func() { _, _ = dl.LoadPositions() },
+		func() { _, _ = dl.LoadAnalyticsPayloads() },
+		func() { _, _ = dl.LoadConversations() },
+	)
+
+	// Run the whole import in one transaction so statements no longer wait on
+	// a commit each, and a failed run leaves the previous data in place.
+	err := conn.TransactCtx(ctx, func(ctx context.Context, session sqlx.Session) error {
+		importAll(ctx, session, dl, truncate)
+		return nil
+	})
+	if err != nil {
+		log.Fatalf("import failed: %v", err)
+	}
+	log.Printf("done.")
+}
+
+func importAll(ctx context.Context, conn sqlx.Session, dl *data.DataLoader, truncate bool) {
 	if truncate {
 		mustExec(ctx, conn, `TRUNCATE TABLE conversation_messages, conversations, model_analytics, trades, positions, account_equity_snapshots, accounts, price_ticks, price_latest, symbols, models RESTART IDENTITY CASCADE`)
 	}
 
-	// Use existing DataLoader to parse JSON
-	dl := data.NewDataLoader(dataPath)
-
 	// Collect models and symbols encountered for upsert
 	modelSet := map[string]struct{}{}
 	symbolSet := map[string]struct{}{}
 
 	// 1) Crypto prices -> price_latest (+symbols)
 	if resp, err := dl.LoadCryptoPrices(); err == nil {
-		for sym, p := range resp.Prices {
+		for sym := range resp.Prices {
 			symbolSet[sym] = struct{}{}
-			upsertSymbol(ctx, conn, sym)
-			upsertPriceLatest(ctx, conn, sym, p.Price, p.Timestamp)
 		}
+		upsertPricesLatest(ctx, conn, resp.Prices)
 		log.Printf("imported crypto prices: %d symbols", len(resp.Prices))
 	} else {
 		log.Printf("skip crypto prices: %v", err)
@@ -68,16 +89,12 @@ func main() {
 		for _, t := range resp.Trades {
 			if t.ModelId != "" {
 				modelSet[t.ModelId] = struct{}{}
-				upsertModel(ctx, conn, t.ModelId, t.ModelId)
 			}
 			if t.Symbol != "" {
 				symbolSet[t.Symbol] = struct{}{}
-				upsertSymbol(ctx, conn, t.Symbol)
 			}
-			entryMs := toMsF(t.EntryTime)
-			exitMs := toMsF(t.ExitTime)
-			insertTrade(ctx, conn, &t, entryMs, exitMs)
 		}
+		insertTrades(ctx, conn, resp.Trades)
 		log.Printf("imported trades: %d", len(resp.Trades))
 	} else {
 		log.Printf("skip trades: %v", err)
@@ -85,51 +102,38 @@ func main() {
 
 	// 4) Positions -> positions (open)
 	if resp, err := dl.LoadPositions(); err == nil {
+		var rows []positionRow
 		for _, pm := range resp.AccountTotals {
 			if pm.ModelId != "" {
 				modelSet[pm.ModelId] = struct{}{}
-				upsertModel(ctx, conn, pm.ModelId, pm.ModelId)
 			}
 			for sym, pos := range pm.Positions {
 				symbolSet[sym] = struct{}{}
-				upsertSymbol(ctx, conn, sym)
-				entryMs := toMsF(pos.EntryTime)
 				pv := positionView{EntryPrice: pos.EntryPrice, Quantity: pos.Quantity, Leverage: pos.Leverage, Confidence: pos.Confidence}
-				insertPositionOpen(ctx, conn, pm.ModelId, sym, pv, entryMs)
+				rows = append(rows, positionRow{ModelId: pm.ModelId, Symbol: sym, View: pv, EntryMs: toMsF(pos.EntryTime)})
 			}
 		}
+		insertPositionsOpen(ctx, conn, rows)
 		log.Printf("imported positions: %d models", len(resp.AccountTotals))
 	} else {
 		log.Printf("skip positions: %v", err)
 	}
 
 	// 5) Analytics -> model_analytics
-	if resp, err := dl.LoadAnalytics(); err == nil {
-		// store per analytics item
-		for _, a := range resp.Analytics {
-			if a.ModelId != "" {
-				modelSet[a.ModelId] = struct{}{}
-				upsertModel(ctx, conn, a.ModelId, a.ModelId)
+	// Decode analytics.json once as raw entries: each payload is stored
+	// verbatim as jsonb, and only model_id is needed from it here.
+	if payloads, err := dl.LoadAnalyticsPayloads(); err == nil {
+		for _, item := range payloads {
+			var probe struct {
+				ModelId string `json:"model_id"`
 			}
-		}
-		// read raw file and write jsonb payload grouped by model
-		rawFile := filepath.Join(dataPath, "analytics.json")
-		raw, _ := os.ReadFile(rawFile)
-		var tmp struct {
-			Analytics []json.RawMessage `json:"analytics"`
-		}
-		if err := json.Unmarshal(raw, &tmp); err == nil {
-			for _, item := range tmp.Analytics {
-				var probe struct {
-					ModelId string `json:"model_id"`
-				}
-				_ = json.Unmarshal(item, &probe)
-				if probe.ModelId != "" {
-					upsertModelAnalytics(ctx, conn, probe.ModelId, item)
-				}
+			_ = json.Unmarshal(item, &probe)
+			if probe.ModelId != "" {
+				modelSet[probe.ModelId] = struct{}{}
+				upsertModelAnalytics(ctx, conn, probe.ModelId, item)
 			}
 		}
-		log.Printf("imported analytics payloads: %d", len(resp.Analytics))
+		log.Printf("imported analytics payloads: %d", len(payloads))
 	} else {
 		log.Printf("skip analytics: %v", err)
 	}
@@ -139,35 +143,43 @@ func main() {
 		for _, c := range resp.Conversations {
 			if c.ModelId != "" {
 				modelSet[c.ModelId] = struct{}{}
-				upsertModel(ctx, conn, c.ModelId, c.ModelId)
-			}
-			convID := insertConversation(ctx, conn, c.ModelId)
-			for _, m := range c.Messages {
-				ts := toMs(m.Timestamp)
-				insertConversationMessage(ctx, conn, convID, m.Role, m.Content, ts)
 			}
+			insertConversation(ctx, conn, c.ModelId, c.Messages)
 		}
 		log.Printf("imported conversations: %d", len(resp.Conversations))
 	} else {
 		log.Printf("skip conversations: %v", err)
 	}
 
+	// Register every model and symbol seen above in one statement each.
+	upsertModels(ctx, conn, modelSet)
+	upsertSymbols(ctx, conn, symbolSet)
 	log.Printf("models upserted: %d, symbols upserted: %d", len(modelSet), len(symbolSet))
-	log.Printf("done.")
+}
+
+// prefetch runs loads concurrently and waits for all of them. Errors are left
+// to the import sections, which reload from the cache and log their skips.
+func prefetch(loads ...func()) {
+	var wg sync.WaitGroup
+	for _, load := range loads {
+		wg.Add(1)
+		go func(load func()) {
+			defer wg.Done()
+			load()
+		}(load)
+	}
+	wg.Wait()
 }
 
 func toMs(v interface{}) int64 {
 	switch t := v.(type) {
+	case float64:
+		// encoding/json decodes every JSON number in an interface{} as float64
+		return toMsF(t)
 	case int64:
 		return t
 	case int:
 		return int64(t)
-	case float64:
-		// some JSON times are seconds, others ms; heuristic: if < 1e12 treat as seconds
-		if t < 1e12 {
-			return int64(t * 1000)
-		}
-		return int64(t)
 	case json.Number:
 		if i, err := t.Int64(); err == nil {
 			return i
@@ -187,6 +199,8 @@ func toMs(v interface{}) int64 {
 	}
 }
 
+// toMsF converts a numeric timestamp to milliseconds. Some JSON times are
+// seconds, others ms; heuristic: if < 1e12 treat as seconds.
 func toMsF(f float64) int64 {
 	if f < 1e12 {
 		return int64(f * 1000)
@@ -194,57 +208,122 @@ func toMsF(f float64) int64 {
 	return int64(f)
 }
 
-func mustExec(ctx context.Context, conn sqlx.SqlConn, query string, args ...interface{}) {
+func mustExec(ctx context.Context, conn sqlx.Session, query string, args ...interface{}) {
 	if _, err := conn.ExecCtx(ctx, query, args...); err != nil {
 		log.Fatalf("exec failed: %v", err)
 	}
 }
 
-func upsertModel(ctx context.Context, conn sqlx.SqlConn, id, display string) {
-	q := `INSERT INTO models(id, display_name) VALUES ($1,$2)
+// upsertModels inserts or renames all collected models with a single statement.
+func upsertModels(ctx context.Context, conn sqlx.Session, modelSet map[string]struct{}) {
+	// Trimming can fold ids together; ON CONFLICT DO UPDATE must see each id once.
+	displayNames := make(map[string]string, len(modelSet))
+	for id := range modelSet {
+		displayNames[strings.TrimSpace(id)] = id
+	}
+	if len(displayNames) == 0 {
+		return
+	}
+	ids := make([]string, 0, len(displayNames))
+	names := make([]string, 0, len(displayNames))
+	for id, name := range displayNames {
+		ids = append(ids, id)
+		names = append(names, name)
+	}
+	q := `INSERT INTO models(id, display_name) SELECT * FROM unnest($1::text[], $2::text[])
           ON CONFLICT (id) DO UPDATE SET display_name=EXCLUDED.display_name`
-	mustExec(ctx, conn, q, strings.TrimSpace(id), display)
+	mustExec(ctx, conn, q, ids, names)
 }
 
-func upsertSymbol(ctx context.Context, conn sqlx.SqlConn, symbol string) {
-	q := `INSERT INTO symbols(symbol) VALUES ($1) ON CONFLICT (symbol) DO NOTHING`
-	mustExec(ctx, conn, q, strings.TrimSpace(symbol))
+// upsertSymbols inserts all collected symbols with a single statement.
+func upsertSymbols(ctx context.Context, conn sqlx.Session, symbolSet map[string]struct{}) {
+	if len(symbolSet) == 0 {
+		return
+	}
+	symbols := make([]string, 0, len(symbolSet))
+	for symbol := range symbolSet {
+		symbols = append(symbols, strings.TrimSpace(symbol))
+	}
+	q := `INSERT INTO symbols(symbol) SELECT unnest($1::text[]) ON CONFLICT (symbol) DO NOTHING`
+	mustExec(ctx, conn, q, symbols)
 }
 
-func upsertPriceLatest(ctx context.Context, conn sqlx.SqlConn, symbol string, price float64, ts int64) {
-	q := `INSERT INTO price_latest(symbol, price, ts_ms) VALUES ($1,$2,$3)
+// upsertPricesLatest writes the latest price of every symbol in one statement.
+func upsertPricesLatest(ctx context.Context, conn sqlx.Session, prices map[string]types.CryptoPrice) {
+	if len(prices) == 0 {
+		return
+	}
+	symbols := make([]string, 0, len(prices))
+	values := make([]float64, 0, len(prices))
+	timestamps := make([]int64, 0, len(prices))
+	for sym, p := range prices {
+		symbols = append(symbols, sym)
+		values = append(values, p.Price)
+		timestamps = append(timestamps, p.Timestamp)
+	}
+	q := `INSERT INTO price_latest(symbol, price, ts_ms)
+          SELECT * FROM unnest($1::text[], $2::float8[], $3::bigint[])
           ON CONFLICT (symbol) DO UPDATE SET price=EXCLUDED.price, ts_ms=EXCLUDED.ts_ms`
-	mustExec(ctx, conn, q, symbol, price, ts)
+	mustExec(ctx, conn, q, symbols, values, timestamps)
 }
 
-func insertEquitySnapshot(ctx context.Context, conn sqlx.SqlConn, modelId string, ts int64, equity float64) {
+func insertEquitySnapshot(ctx context.Context, conn sqlx.Session, modelId string, ts int64, equity float64) {
 	q := `INSERT INTO account_equity_snapshots(model_id, ts_ms, equity_usd) VALUES ($1,$2,$3)`
 	mustExec(ctx, conn, q, modelId, ts, equity)
 }
 
-func insertTrade(ctx context.Context, conn sqlx.SqlConn, t *types.Trade, entryMs, exitMs int64) {
+// importBatchSize caps the rows sent per multi-row INSERT statement.
+const importBatchSize = 1000
+
+// insertTrades writes trades in batches of importBatchSize, one statement per
+// batch, with parallel arrays expanded server-side by unnest.
+func insertTrades(ctx context.Context, conn sqlx.Session, trades []types.Trade) {
 	q := `INSERT INTO trades(
             id, model_id, symbol, side, trade_type, quantity, leverage, confidence,
             entry_price, entry_ts_ms, exit_price, exit_ts_ms,
             realized_gross_pnl, realized_net_pnl, total_commission_dollars)
-          VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14,$15)
+          SELECT * FROM unnest(
+            $1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+            $6::float8[], $7::float8[], $8::float8[], $9::float8[], $10::bigint[],
+            $11::float8[], $12::bigint[], $13::float8[], $14::float8[], $15::float8[])
           ON CONFLICT (id) DO NOTHING`
-	mustExec(ctx, conn, q, t.Id, t.ModelId, t.Symbol, t.Side, nullIfEmpty(t.TradeType),
-		nullFloat(t.Quantity), nullFloat(t.Leverage), nullFloat(t.Confidence), t.EntryPrice, entryMs,
-		t.ExitPrice, exitMs, t.RealizedGrossPnl, t.RealizedNetPnl, t.TotalCommissionDollars)
+	for start := 0; start < len(trades); start += importBatchSize {
+		batch := trades[start:min(start+importBatchSize, len(trades))]
+		n := len(batch)
+		var (
+			ids, modelIds, symbols, sides = make([]string, n), make([]string, n), make([]string, n), make([]string, n)
+			tradeTypes                    = make([]*string, n)
+			quantities, leverages, confs  = make([]*float64, n), make([]*float64, n), make([]*float64, n)
+			entryPrices, exitPrices       = make([]float64, n), make([]float64, n)
+			entryMs, exitMs               = make([]int64, n), make([]int64, n)
+			grossPnl, netPnl, commissions = make([]float64, n), make([]float64, n), make([]float64, n)
+		)
+		for i := range batch {
+			t := &batch[i]
+			ids[i], modelIds[i], symbols[i], sides[i] = t.Id, t.ModelId, t.Symbol, t.Side
+			tradeTypes[i] = nullIfEmpty(t.TradeType)
+			quantities[i], leverages[i], confs[i] = nullFloat(t.Quantity), nullFloat(t.Leverage), nullFloat(t.Confidence)
+			entryPrices[i], entryMs[i] = t.EntryPrice, toMsF(t.EntryTime)
+			exitPrices[i], exitMs[i] = t.ExitPrice, toMsF(t.ExitTime)
+			grossPnl[i], netPnl[i], commissions[i] = t.RealizedGrossPnl, t.RealizedNetPnl, t.TotalCommissionDollars
+		}
+		mustExec(ctx, conn, q, ids, modelIds, symbols, sides, tradeTypes,
+			quantities, leverages, confs, entryPrices, entryMs,
+			exitPrices, exitMs, grossPnl, netPnl, commissions)
+	}
 }
 
-func nullIfEmpty(s string) interface{} {
+func nullIfEmpty(s string) *string {
 	if strings.TrimSpace(s) == "" {
 		return nil
 	}
-	return s
+	return &s
 }
-func nullFloat(f float64) interface{} {
+func nullFloat(f float64) *float64 {
 	if f == 0 {
 		return nil
 	}
-	return f
+	return &f
 }
 
 type positionView struct {
@@ -254,34 +333,65 @@ type positionView struct {
 	Confidence float64 `json:"confidence"`
 }
 
-func insertPositionOpen(ctx context.Context, conn sqlx.SqlConn, modelId, symbol string, pos positionView, entryMs int64) {
+// positionRow is an open position queued for insertPositionsOpen.
+type positionRow struct {
+	ModelId string
+	Symbol  string
+	View    positionView
+	EntryMs int64
+}
+
+// insertPositionsOpen writes open positions in batches of importBatchSize.
+func insertPositionsOpen(ctx context.Context, conn sqlx.Session, rows []positionRow) {
 	q := `INSERT INTO positions(id, model_id, symbol, side, entry_price, quantity, leverage, confidence, entry_ts_ms, status)
-          VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,'open')
+          SELECT id, model_id, symbol, side, entry_price, quantity, leverage, confidence, entry_ts_ms, 'open'
+          FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::float8[], $6::float8[], $7::float8[], $8::float8[], $9::bigint[])
+            AS p(id, model_id, symbol, side, entry_price, quantity, leverage, confidence, entry_ts_ms)
           ON CONFLICT (id) DO NOTHING`
-	pid := fmt.Sprintf("%s:%s:%d", modelId, symbol, entryMs)
-	side := "long" // 无法从示例数据稳定推断多空，默认 long；后续由导入源决定
-	mustExec(ctx, conn, q, pid, modelId, symbol, side, pos.EntryPrice, pos.Quantity, nullFloat(pos.Leverage), nullFloat(pos.Confidence), entryMs)
+	for start := 0; start < len(rows); start += importBatchSize {
+		batch := rows[start:min(start+importBatchSize, len(rows))]
+		n := len(batch)
+		var (
+			ids, modelIds, symbols, sides = make([]string, n), make([]string, n), make([]string, n), make([]string, n)
+			entryPrices, quantities       = make([]float64, n), make([]float64, n)
+			leverages, confs              = make([]*float64, n), make([]*float64, n)
+			entryMs                       = make([]int64, n)
+		)
+		for i, r := range batch {
+			ids[i] = fmt.Sprintf("%s:%s:%d", r.ModelId, r.Symbol, r.EntryMs)
+			modelIds[i], symbols[i] = r.ModelId, r.Symbol
+			sides[i] = "long" // 无法从示例数据稳定推断多空，默认 long；后续由导入源决定
+			entryPrices[i], quantities[i] = r.View.EntryPrice, r.View.Quantity
+			leverages[i], confs[i] = nullFloat(r.View.Leverage), nullFloat(r.View.Confidence)
+			entryMs[i] = r.EntryMs
+		}
+		mustExec(ctx, conn, q, ids, modelIds, symbols, sides, entryPrices, quantities, leverages, confs, entryMs)
+	}
 }
 
-func upsertModelAnalytics(ctx context.Context, conn sqlx.SqlConn, modelId string, payload json.RawMessage) {
+func upsertModelAnalytics(ctx context.Context, conn sqlx.Session, modelId string, payload json.RawMessage) {
 	q := `INSERT INTO model_analytics(model_id, payload) VALUES ($1,$2)
           ON CONFLICT (model_id) DO UPDATE SET payload=EXCLUDED.payload, updated_at=now()`
 	mustExec(ctx, conn, q, modelId, string(payload))
 }
 
-func insertConversation(ctx context.Context, conn sqlx.SqlConn, modelId string) int64 {
-	q := `INSERT INTO conversations(model_id) VALUES ($1) RETURNING id`
-	var id int64
-	if err := conn.QueryRowCtx(ctx, &id, q, modelId); err != nil {
-		log.Fatalf("insert conversation: %v", err)
-	}
-	return id
-}
-
-func insertConversationMessage(ctx context.Context, conn sqlx.SqlConn, convId int64, role, content string, ts int64) {
-	if role == "" {
-		role = "assistant"
+// insertConversation writes a conversation and all of its messages in one
+// statement: the data-modifying CTE always runs, even with no messages.
+func insertConversation(ctx context.Context, conn sqlx.Session, modelId string, messages []types.ConversationMessage) {
+	roles := make([]string, len(messages))
+	contents := make([]string, len(messages))
+	timestamps := make([]int64, len(messages))
+	for i, m := range messages {
+		roles[i] = m.Role
+		if roles[i] == "" {
+			roles[i] = "assistant"
+		}
+		contents[i] = m.Content
+		timestamps[i] = toMs(m.Timestamp)
 	}
-	q := `INSERT INTO conversation_messages(conversation_id, role, content, ts_ms) VALUES ($1,$2,$3,$4)`
-	mustExec(ctx, conn, q, convId, role, content, ts)
+	q := `WITH c AS (INSERT INTO conversations(model_id) VALUES ($1) RETURNING id)
+          INSERT INTO conversation_messages(conversation_id, role, content, ts_ms)
+          SELECT c.id, m.role, m.content, m.ts_ms
+          FROM c CROSS JOIN unnest($2::text[], $3::text[], $4::bigint[]) AS m(role, content, ts_ms)`
+	mustExec(ctx, conn, q, modelId, roles, contents, timestamps)
 }
@@ -2,48 +2,119 @@ package data
 
 import (
 	"encoding/json"
+	"fmt"
+	"hash/fnv"
 	"os"
 	"path/filepath"
+	"reflect"
+	"sync"
 	"time"
 
 	"nof0-api/internal/types"
 )
 
+// CacheTTL bounds how long decoded data files are served from memory, grouped
+// by how often the underlying file is expected to change. A zero TTL means
+// entries only expire when the file's modification time changes.
+type CacheTTL struct {
+	Short  time.Duration // fast-moving data: prices, account totals, positions
+	Medium time.Duration // trades, analytics, conversations
+	Long   time.Duration // static-ish data such as the leaderboard
+}
+
 // DataLoader handles loading JSON data from MCP data files
 type DataLoader struct {
 	dataPath string
+	ttl      CacheTTL
+
+	mu    sync.RWMutex
+	cache map[cacheKey]cachedFile
+	fills map[string]*sync.Mutex
+
+	analyticsIndex analyticsIndex
+}
+
+// analyticsIndex maps model ids to their entries in the decoded
+// analytics.json it was built from.
+type analyticsIndex struct {
+	source  *types.AnalyticsResponse
+	byModel map[string]*types.ModelAnalytics
+}
+
+// cacheKey identifies one decoding of a data file; the same file may be cached
+// as several types, e.g. typed structs and raw payloads.
+type cacheKey struct {
+	filename string
+	typ      reflect.Type
+}
+
+// cachedFile is a decoded data file and the file version it was decoded from.
+type cachedFile struct {
+	modTime  time.Time
+	size     int64
+	loadedAt time.Time
+	value    any
 }
 
+// loaderKey identifies a shared DataLoader instance.
+type loaderKey struct {
+	dataPath string
+	ttl      CacheTTL
+}
+
+// loaders is never evicted: a process normally uses one or two data paths, so
+// each loader, and its cache, lives as long as the process.
+var (
+	loadersMu sync.Mutex
+	loaders   = make(map[loaderKey]*DataLoader)
+)
+
 func NewDataLoader(dataPath string) *DataLoader {
-	return &DataLoader{
+	return NewDataLoaderWithTTL(dataPath, CacheTTL{})
+}
+
+// NewDataLoaderWithTTL returns a DataLoader whose decoded files are reused
+// for at most the given TTLs, and never past a change to the file. Loaders
+// are shared per data path and TTL, so every caller in the process reuses
+// the same cache.
+func NewDataLoaderWithTTL(dataPath string, ttl CacheTTL) *DataLoader {
+	key := loaderKey{dataPath: dataPath, ttl: ttl}
+	loadersMu.Lock()
+	defer loadersMu.Unlock()
+	if dl, ok := loaders[key]; ok {
+		return dl
+	}
+	dl := &DataLoader{
 		dataPath: dataPath,
+		ttl:      ttl,
+		cache:    make(map[cacheKey]cachedFile),
+		fills:    make(map[string]*sync.Mutex),
 	}
+	loaders[key] = dl
+	return dl
 }
 
 // LoadCryptoPrices loads crypto prices from JSON file
 func (dl *DataLoader) LoadCryptoPrices() (*types.CryptoPricesResponse, error) {
-	var response types.CryptoPricesResponse
-	err := dl.loadJSONFile("crypto-prices.json", &response)
-	return &response, err
+	return loadCached[types.CryptoPricesResponse](dl, "crypto-prices.json")
 }
 
 // LoadAccountTotals loads account totals from JSON file
 func (dl *DataLoader) LoadAccountTotals() (*types.AccountTotalsResponse, error) {
-	var response types.AccountTotalsResponse
-	err := dl.loadJSONFile("account-totals.json", &response)
+	cached, err := loadCached[types.AccountTotalsResponse](dl, "account-totals.json")
 	if err != nil {
 		return nil, err
 	}
+	response := *cached
 	response.ServerTime = getCurrentTimestamp()
 	return &response, nil
 }
 
 // LoadTrades loads trades from JSON file
 func (dl *DataLoader) LoadTrades() (*types.TradesResponse, error) {
-	var data struct {
+	data, err := loadCached[struct {
 		Trades []types.Trade `json:"trades"`
-	}
-	err := dl.loadJSONFile("trades.json", &data)
+	}](dl, "trades.json")
 	if err != nil {
 		return nil, err
 	}
@@ -56,44 +127,51 @@ func (dl *DataLoader) LoadTrades() (*types.TradesResponse, error) {
 
 // LoadSinceInception loads since inception values from JSON file
 func (dl *DataLoader) LoadSinceInception() (*types.SinceInceptionResponse, error) {
-	var response types.SinceInceptionResponse
-	err := dl.loadJSONFile("since-inception-values.json", &response)
+	cached, err := loadCached[types.SinceInceptionResponse](dl, "since-inception-values.json")
 	if err != nil {
 		return nil, err
 	}
+	response := *cached
 	response.ServerTime = getCurrentTimestamp()
 	return &response, nil
 }
 
 // LoadLeaderboard loads leaderboard from JSON file
 func (dl *DataLoader) LoadLeaderboard() (*types.LeaderboardResponse, error) {
-	var response types.LeaderboardResponse
-	err := dl.loadJSONFile("leaderboard.json", &response)
-	return &response, err
+	return loadCached[types.LeaderboardResponse](dl, "leaderboard.json")
 }
 
 // LoadAnalytics loads all analytics from JSON file
 func (dl *DataLoader) LoadAnalytics() (*types.AnalyticsResponse, error) {
-	var response types.AnalyticsResponse
-	err := dl.loadJSONFile("analytics.json", &response)
+	cached, err := loadCached[types.AnalyticsResponse](dl, "analytics.json")
 	if err != nil {
 		return nil, err
 	}
+	response := *cached
 	response.ServerTime = getCurrentTimestamp()
 	return &response, nil
 }
 
+// LoadAnalyticsPayloads returns each analytics.json entry as raw JSON, for
+// callers that store the payload verbatim rather than its typed fields.
+func (dl *DataLoader) LoadAnalyticsPayloads() ([]json.RawMessage, error) {
+	data, err := loadCached[struct {
+		Analytics []json.RawMessage `json:"analytics"`
+	}](dl, "analytics.json")
+	if err != nil {
+		return nil, err
+	}
+	return data.Analytics, nil
+}
+
 // LoadModelAnalytics loads analytics for a specific model
 func (dl *DataLoader) LoadModelAnalytics(modelId string) (*types.ModelAnalyticsResponse, error) {
 	// Try to load model-specific file first
-	var analytics types.ModelAnalytics
 	filename := "analytics-" + modelId + ".json"
 
-	var data struct {
+	data, err := loadCached[struct {
 		Analytics types.ModelAnalytics `json:"analytics"`
-	}
-
-	err := dl.loadJSONFile(filename, &data)
+	}](dl, filename)
 	if err == nil {
 		return &types.ModelAnalyticsResponse{
 			Analytics:  data.Analytics,
@@ -101,21 +179,16 @@ func (dl *DataLoader) LoadModelAnalytics(modelId string) (*types.ModelAnalyticsR
 		}, nil
 	}
 
-	// Fallback to loading from main analytics file
-	allAnalytics, err := dl.LoadAnalytics()
+	// Fallback to the main analytics file
+	index, err := dl.modelAnalyticsIndex()
 	if err != nil {
 		return nil, err
 	}
-
-	// Find the specific model
-	for _, a := range allAnalytics.Analytics {
-		if a.ModelId == modelId {
-			analytics = a
-			return &types.ModelAnalyticsResponse{
-				Analytics:  analytics,
-				ServerTime: getCurrentTimestamp(),
-			}, nil
-		}
+	if analytics, ok := index[modelId]; ok {
+		return &types.ModelAnalyticsResponse{
+			Analytics:  *analytics,
+			ServerTime: getCurrentTimestamp(),
+		}, nil
 	}
 
 	// Return empty analytics if not found
@@ -127,6 +200,132 @@ func (dl *DataLoader) LoadModelAnalytics(modelId string) (*types.ModelAnalyticsR
 	}, nil
 }
 
+// ETag returns a weak entity tag for the current version of filename. It is
+// derived from the modification time and size that key the decode cache, so it
+// changes whenever a load would decode the file again and costs only a stat.
+func (dl *DataLoader) ETag(filename string) (string, error) {
+	info, err := os.Stat(filepath.Join(dl.dataPath, filename))
+	if err != nil {
+		return "", err
+	}
+	h := fnv.New64a()
+	_, _ = h.Write([]byte(filename))
+	return fmt.Sprintf(`W/"%x-%x-%x"`, h.Sum64(), info.ModTime().UnixNano(), info.Size()), nil
+}
+
+// ModelAnalyticsETag returns the ETag of the file LoadModelAnalytics serves
+// modelId from: its own analytics file if present, analytics.json otherwise.
+func (dl *DataLoader) ModelAnalyticsETag(modelId string) (string, error) {
+	if etag, err := dl.ETag("analytics-" + modelId + ".json"); err == nil {
+		return etag, nil
+	}
+	return dl.ETag("analytics.json")
+}
+
+// modelAnalyticsIndex returns analytics.json entries keyed by model id,
+// rebuilding the index whenever the cached file is reloaded.
+func (dl *DataLoader) modelAnalyticsIndex() (map[string]*types.ModelAnalytics, error) {
+	all, err := loadCached[types.AnalyticsResponse](dl, "analytics.json")
+	if err != nil {
+		return nil, err
+	}
+
+	dl.mu.RLock()
+	index := dl.analyticsIndex
+	dl.mu.RUnlock()
+	if index.source == all {
+		return index.byModel, nil
+	}
+
+	byModel := make(map[string]*types.ModelAnalytics, len(all.Analytics))
+	for i := range all.Analytics {
+		a := &all.Analytics[i]
+		if _, seen := byModel[a.ModelId]; !seen {
+			byModel[a.ModelId] = a
+		}
+	}
+	dl.mu.Lock()
+	dl.analyticsIndex = analyticsIndex{source: all, byModel: byModel}
+	dl.mu.Unlock()
+	return byModel, nil
+}
+
+// loadCached decodes filename into a T, reusing the previously decoded value
+// while the file's modification time and size are unchanged and the entry is
+// within its TTL. Concurrent misses on the same file decode it only once. The
+// returned value is shared between callers and must not be mutated.
+func loadCached[T any](dl *DataLoader, filename string) (*T, error) {
+	info, err := os.Stat(filepath.Join(dl.dataPath, filename))
+	if err != nil {
+		return nil, err
+	}
+	key := cacheKey{filename: filename, typ: reflect.TypeOf((*T)(nil))}
+	if v, ok := lookupCached[T](dl, key, info); ok {
+		return v, nil
+	}
+
+	fill := dl.fillLock(filename)
+	fill.Lock()
+	defer fill.Unlock()
+	// Another caller may have decoded this version while we waited.
+	if v, ok := lookupCached[T](dl, key, info); ok {
+		return v, nil
+	}
+
+	var v T
+	if err := dl.loadJSONFile(filename, &v); err != nil {
+		return nil, err
+	}
+
+	dl.mu.Lock()
+	dl.cache[key] = cachedFile{modTime: info.ModTime(), size: info.Size(), loadedAt: time.Now(), value: &v}
+	dl.mu.Unlock()
+	return &v, nil
+}
+
+// lookupCached returns the cached value for key if it was decoded from the
+// file version described by info and has not expired.
+func lookupCached[T any](dl *DataLoader, key cacheKey, info os.FileInfo) (*T, bool) {
+	dl.mu.RLock()
+	entry, ok := dl.cache[key]
+	dl.mu.RUnlock()
+	if !ok || !entry.modTime.Equal(info.ModTime()) || entry.size != info.Size() ||
+		dl.expired(key.filename, entry, time.Now()) {
+		return nil, false
+	}
+	v, ok := entry.value.(*T)
+	return v, ok
+}
+
+// fillLock returns the mutex serialising decodes of filename.
+func (dl *DataLoader) fillLock(filename string) *sync.Mutex {
+	dl.mu.Lock()
+	defer dl.mu.Unlock()
+	m, ok := dl.fills[filename]
+	if !ok {
+		m = &sync.Mutex{}
+		dl.fills[filename] = m
+	}
+	return m
+}
+
+// expired reports whether a cache entry has outlived the TTL of its file.
+func (dl *DataLoader) expired(filename string, entry cachedFile, now time.Time) bool {
+	ttl := dl.ttlFor(filename)
+	return ttl > 0 && now.Sub(entry.loadedAt) >= ttl
+}
+
+func (dl *DataLoader) ttlFor(filename string) time.Duration {
+	switch filename {
+	case "crypto-prices.json", "account-totals.json", "positions.json":
+		return dl.ttl.Short
+	case "leaderboard.json":
+		return dl.ttl.Long
+	default:
+		return dl.ttl.Medium
+	}
+}
+
 // Helper function to load JSON file
 func (dl *DataLoader) loadJSONFile(filename string, v interface{}) error {
 	filePath := filepath.Join(dl.dataPath, filename)
@@ -139,10 +338,9 @@ func (dl *DataLoader) loadJSONFile(filename string, v interface{}) error {
 
 // LoadPositions loads positions from JSON file
 func (dl *DataLoader) LoadPositions() (*types.PositionsResponse, error) {
-	var data struct {
+	data, err := loadCached[struct {
 		AccountTotals []types.PositionsByModel `json:"accountTotals"`
-	}
-	err := dl.loadJSONFile("positions.json", &data)
+	}](dl, "positions.json")
 	if err != nil {
 		return nil, err
 	}
@@ -155,10 +353,9 @@ func (dl *DataLoader) LoadPositions() (*types.PositionsResponse, error) {
 
 // LoadConversations loads conversations from JSON file
 func (dl *DataLoader) LoadConversations() (*types.ConversationsResponse, error) {
-	var data struct {
+	data, err := loadCached[struct {
 		Conversations []types.Conversation `json:"conversations"`
-	}
-	err := dl.loadJSONFile("conversations.json", &data)
+	}](dl, "conversations.json")
 	if err != nil {
 		return nil, err
 	}
@@ -1,10 +1,16 @@
 package data
 
 import (
+	"os"
+	"path/filepath"
+	"sync"
 	"testing"
+	"time"
 
 	"github.com/stretchr/testify/assert"
 	"github.com/stretchr/testify/require"
+
+	"nof0-api/internal/types"
 )
 
 const testDataPath = "../../../mcp/data"
@@ -15,6 +21,13 @@ func TestNewDataLoader(t *testing.T) {
 	assert.Equal(t, testDataPath, loader.dataPath)
 }
 
+func TestNewDataLoaderSharedPerPathAndTTL(t *testing.T) {
+	assert.Same(t, NewDataLoader(testDataPath), NewDataLoader(testDataPath))
+	assert.NotSame(t, NewDataLoader(testDataPath), NewDataLoader(t.TempDir()))
+	assert.NotSame(t, NewDataLoader(testDataPath),
+		NewDataLoaderWithTTL(testDataPath, CacheTTL{Short: time.Second}))
+}
+
 func TestLoadCryptoPrices(t *testing.T) {
 	loader := NewDataLoader(testDataPath)
 
@@ -197,6 +210,28 @@ func TestLoadModelAnalytics(t *testing.T) {
 	}
 }
 
+func TestLoadModelAnalyticsIndexFollowsFileChanges(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "analytics.json")
+	require.NoError(t, os.WriteFile(path, []byte(`{"analytics":[{"id":"1","model_id":"a"}]}`), 0o644))
+
+	loader := NewDataLoader(dir)
+	resp, err := loader.LoadModelAnalytics("a")
+	require.NoError(t, err)
+	assert.Equal(t, "1", resp.Analytics.Id)
+
+	require.NoError(t, os.WriteFile(path, []byte(`{"analytics":[{"id":"2","model_id":"a"},{"id":"3","model_id":"b"}]}`), 0o644))
+	later := time.Now().Add(time.Minute)
+	require.NoError(t, os.Chtimes(path, later, later))
+
+	resp, err = loader.LoadModelAnalytics("a")
+	require.NoError(t, err)
+	assert.Equal(t, "2", resp.Analytics.Id)
+	resp, err = loader.LoadModelAnalytics("b")
+	require.NoError(t, err)
+	assert.Equal(t, "3", resp.Analytics.Id)
+}
+
 func TestLoadNonExistentFile(t *testing.T) {
 	loader := NewDataLoader("/nonexistent/path")
 
@@ -213,7 +248,182 @@ func TestLoadInvalidJSON(t *testing.T) {
 	assert.Error(t, err, "Should return error for invalid JSON")
 }
 
+func TestLoadCachedReusesUntilFileChanges(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "leaderboard.json")
+	require.NoError(t, os.WriteFile(path, []byte(`{"leaderboard":[{"id":"a"}]}`), 0o644))
+
+	loader := NewDataLoader(dir)
+	first, err := loader.LoadLeaderboard()
+	require.NoError(t, err)
+	second, err := loader.LoadLeaderboard()
+	require.NoError(t, err)
+	assert.Same(t, first, second, "unchanged file should be served from cache")
+
+	require.NoError(t, os.WriteFile(path, []byte(`{"leaderboard":[{"id":"a"},{"id":"b"}]}`), 0o644))
+	later := time.Now().Add(time.Minute)
+	require.NoError(t, os.Chtimes(path, later, later))
+
+	third, err := loader.LoadLeaderboard()
+	require.NoError(t, err)
+	assert.NotSame(t, first, third)
+	assert.Len(t, third.Leaderboard, 2)
+}
+
+func TestLoadCachedDetectsSizeChangeWithSameModTime(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "leaderboard.json")
+	stamp := time.Now().Add(-time.Hour).Truncate(time.Second)
+	require.NoError(t, os.WriteFile(path, []byte(`{"leaderboard":[{"id":"a"}]}`), 0o644))
+	require.NoError(t, os.Chtimes(path, stamp, stamp))
+
+	loader := NewDataLoader(dir)
+	first, err := loader.LoadLeaderboard()
+	require.NoError(t, err)
+
+	require.NoError(t, os.WriteFile(path, []byte(`{"leaderboard":[{"id":"a"},{"id":"b"}]}`), 0o644))
+	require.NoError(t, os.Chtimes(path, stamp, stamp))
+
+	second, err := loader.LoadLeaderboard()
+	require.NoError(t, err)
+	assert.NotSame(t, first, second)
+	assert.Len(t, second.Leaderboard, 2)
+}
+
+func TestLoadCachedConcurrentMissesShareDecode(t *testing.T) {
+	// A fresh directory keeps the shared per-path loader cold, so every
+	// goroutine starts on a cache miss.
+	dir := t.TempDir()
+	require.NoError(t, os.WriteFile(filepath.Join(dir, "leaderboard.json"), []byte(`{"leaderboard":[{"id":"a"}]}`), 0o644))
+	loader := NewDataLoader(dir)
+
+	results := make([]*types.LeaderboardResponse, 8)
+	var wg sync.WaitGroup
+	for i := range results {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			results[i], _ = loader.LoadLeaderboard()
+		}(i)
+	}
+	wg.Wait()
+
+	require.NotNil(t, results[0])
+	for _, r := range results[1:] {
+		assert.Same(t, results[0], r)
+	}
+}
+
+func TestLoadAnalyticsPayloadsSharesCacheWithTypedDecode(t *testing.T) {
+	loader := NewDataLoader(testDataPath)
+
+	typed, err := loadCached[types.AnalyticsResponse](loader, "analytics.json")
+	require.NoError(t, err)
+	payloads, err := loader.LoadAnalyticsPayloads()
+	require.NoError(t, err)
+	assert.Len(t, payloads, len(typed.Analytics))
+
+	again, err := loadCached[types.AnalyticsResponse](loader, "analytics.json")
+	require.NoError(t, err)
+	assert.Same(t, typed, again, "raw and typed decodes should be cached side by side")
+}
+
+func TestETagFollowsFileVersion(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "trades.json")
+	require.NoError(t, os.WriteFile(path, []byte(`{"trades":[]}`), 0o644))
+
+	loader := NewDataLoader(dir)
+	first, err := loader.ETag("trades.json")
+	require.NoError(t, err)
+	assert.Regexp(t, `^W/".+"$`, first)
+	again, err := loader.ETag("trades.json")
+	require.NoError(t, err)
+	assert.Equal(t, first, again)
+
+	require.NoError(t, os.WriteFile(path, []byte(`{"trades":[{}]}`), 0o644))
+	later := time.Now().Add(time.Minute)
+	require.NoError(t, os.Chtimes(path, later, later))
+	changed, err := loader.ETag("trades.json")
+	require.NoError(t, err)
+	assert.NotEqual(t, first, changed)
+
+	_, err = loader.ETag("missing.json")
+	assert.Error(t, err)
+}
+
+func TestModelAnalyticsETagFallsBackToAnalytics(t *testing.T) {
+	loader := NewDataLoader(testDataPath)
+
+	own, err := loader.ModelAnalyticsETag("gpt-5")
+	require.NoError(t, err)
+	ownFile, err := loader.ETag("analytics-gpt-5.json")
+	require.NoError(t, err)
+	assert.Equal(t, ownFile, own)
+
+	fallback, err := loader.ModelAnalyticsETag("nonexistent-model")
+	require.NoError(t, err)
+	all, err := loader.ETag("analytics.json")
+	require.NoError(t, err)
+	assert.Equal(t, all, fallback)
+}
+
+func TestLoadCachedExpiresAfterTTL(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "crypto-prices.json")
+	require.NoError(t, os.WriteFile(path, []byte(`{"prices":{},"serverTime":1}`), 0o644))
+
+	loader := NewDataLoaderWithTTL(dir, CacheTTL{Short: time.Nanosecond})
+	first, err := loader.LoadCryptoPrices()
+	require.NoError(t, err)
+	time.Sleep(time.Millisecond)
+	second, err := loader.LoadCryptoPrices()
+	require.NoError(t, err)
+	assert.NotSame(t, first, second, "expired entry should be reloaded")
+}
+
+func TestLoadStampsServerTimeOnCopy(t *testing.T) {
+	loader := NewDataLoader(testDataPath)
+
+	first, err := loader.LoadAnalytics()
+	require.NoError(t, err)
+	first.ServerTime = 0
+
+	second, err := loader.LoadAnalytics()
+	require.NoError(t, err)
+	assert.NotZero(t, second.ServerTime, "callers must not mutate the cached response")
+}
+
 // Benchmark tests
+//
+// BenchmarkLoad* measure the cached path: after the first iteration each call
+// is a stat plus a cache lookup. BenchmarkDecode measures the cold path by
+// reading and decoding each file on every iteration, bypassing the cache.
+
+func BenchmarkDecode(b *testing.B) {
+	files := []struct {
+		name string
+		into func() any
+	}{
+		{"crypto-prices.json", func() any { return new(types.CryptoPricesResponse) }},
+		{"leaderboard.json", func() any { return new(types.LeaderboardResponse) }},
+		{"trades.json", func() any { return new(types.TradesResponse) }},
+		{"account-totals.json", func() any { return new(types.AccountTotalsResponse) }},
+		{"analytics.json", func() any { return new(types.AnalyticsResponse) }},
+		{"positions.json", func() any { return new(types.PositionsResponse) }},
+		{"conversations.json", func() any { return new(types.ConversationsResponse) }},
+	}
+	loader := NewDataLoader(testDataPath)
+	for _, f := range files {
+		b.Run(f.name, func(b *testing.B) {
+			for i := 0; i < b.N; i++ {
+				if err := loader.loadJSONFile(f.name, f.into()); err != nil {
+					b.Fatal(err)
+				}
+			}
+		})
+	}
+}
 
 func BenchmarkLoadCryptoPrices(b *testing.B) {
 	loader := NewDataLoader(testDataPath)
@@ -21,6 +21,9 @@ func AccountTotalsHandler(svcCtx *svc.ServiceContext) http.HandlerFunc {
 		}
 
 		l := logic.NewAccountTotalsLogic(r.Context(), svcCtx)
+		if etag, err := l.ETag(); err == nil && notModified(w, r, etag) {
+			return
+		}
 		resp, err := l.AccountTotals(&req)
 		if err != nil {
 			httpx.ErrorCtx(r.Context(), w, err)
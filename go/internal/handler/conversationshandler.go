@@ -14,6 +14,9 @@ import (
 func ConversationsHandler(svcCtx *svc.ServiceContext) http.HandlerFunc {
 	return func(w http.ResponseWriter, r *http.Request) {
 		l := logic.NewConversationsLogic(r.Context(), svcCtx)
+		if etag, err := l.ETag(); err == nil && notModified(w, r, etag) {
+			return
+		}
 		resp, err := l.Conversations()
 		if err != nil {
 			httpx.ErrorCtx(r.Context(), w, err)
@@ -0,0 +1,34 @@
+package handler
+
+import (
+	"net/http"
+	"strings"
+)
+
+// notModified sets etag on the response and, when the request's If-None-Match
+// already matches it, answers 304 Not Modified and reports true so the handler
+// can return without loading or encoding the body.
+func notModified(w http.ResponseWriter, r *http.Request, etag string) bool {
+	w.Header().Set("ETag", etag)
+	if !etagMatches(r.Header.Get("If-None-Match"), etag) {
+		return false
+	}
+	w.WriteHeader(http.StatusNotModified)
+	return true
+}
+
+// etagMatches reports whether an If-None-Match header matches etag using the
+// weak comparison required for GET requests.
+func etagMatches(header, etag string) bool {
+	if header == "" {
+		return false
+	}
+	want := strings.TrimPrefix(etag, "W/")
+	for _, candidate := range strings.Split(header, ",") {
+		candidate = strings.TrimSpace(candidate)
+		if candidate == "*" || strings.TrimPrefix(candidate, "W/") == want {
+			return true
+		}
+	}
+	return false
+}
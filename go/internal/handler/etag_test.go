@@ -0,0 +1,35 @@
+package handler
+
+import (
+	"net/http"
+	"net/http/httptest"
+	"testing"
+
+	"github.com/stretchr/testify/assert"
+)
+
+func TestNotModified(t *testing.T) {
+	req := httptest.NewRequest(http.MethodGet, "/api/trades", nil)
+	rec := httptest.NewRecorder()
+	assert.False(t, notModified(rec, req, `W/"v1"`))
+	assert.Equal(t, `W/"v1"`, rec.Header().Get("ETag"))
+
+	req.Header.Set("If-None-Match", `W/"v1"`)
+	rec = httptest.NewRecorder()
+	assert.True(t, notModified(rec, req, `W/"v1"`))
+	assert.Equal(t, http.StatusNotModified, rec.Code)
+	assert.Empty(t, rec.Body.String())
+
+	rec = httptest.NewRecorder()
+	assert.False(t, notModified(rec, req, `W/"v2"`))
+	assert.Equal(t, `W/"v2"`, rec.Header().Get("ETag"))
+}
+
+func TestETagMatches(t *testing.T) {
+	assert.True(t, etagMatches(`W/"abc"`, `W/"abc"`))
+	assert.True(t, etagMatches(`"abc"`, `W/"abc"`))
+	assert.True(t, etagMatches(`"x", W/"abc"`, `W/"abc"`))
+	assert.True(t, etagMatches(`*`, `W/"abc"`))
+	assert.False(t, etagMatches(``, `W/"abc"`))
+	assert.False(t, etagMatches(`W/"abd"`, `W/"abc"`))
+}
@@ -19,6 +19,9 @@ func ModelAnalyticsHandler(svcCtx *svc.ServiceContext) http.HandlerFunc {
 		modelId := vars["modelId"]
 
 		l := logic.NewModelAnalyticsLogic(r.Context(), svcCtx)
+		if etag, err := l.ETag(modelId); err == nil && notModified(w, r, etag) {
+			return
+		}
 		resp, err := l.ModelAnalytics(modelId)
 		if err != nil {
 			httpx.ErrorCtx(r.Context(), w, err)
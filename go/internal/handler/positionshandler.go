@@ -21,6 +21,9 @@ func PositionsHandler(svcCtx *svc.ServiceContext) http.HandlerFunc {
 		}
 
 		l := logic.NewPositionsLogic(r.Context(), svcCtx)
+		if etag, err := l.ETag(); err == nil && notModified(w, r, etag) {
+			return
+		}
 		resp, err := l.Positions(&req)
 		if err != nil {
 			httpx.ErrorCtx(r.Context(), w, err)
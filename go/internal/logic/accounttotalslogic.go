@@ -29,3 +29,9 @@ func NewAccountTotalsLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Acc
 func (l *AccountTotalsLogic) AccountTotals(req *types.AccountTotalsRequest) (resp *types.AccountTotalsResponse, err error) {
 	return l.svcCtx.DataLoader.LoadAccountTotals()
 }
+
+// ETag identifies the version of the data served by AccountTotals, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *AccountTotalsLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("account-totals.json")
+}
@@ -29,3 +29,9 @@ func NewAnalyticsLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Analyti
 func (l *AnalyticsLogic) Analytics() (resp *types.AnalyticsResponse, err error) {
 	return l.svcCtx.DataLoader.LoadAnalytics()
 }
+
+// ETag identifies the version of the data served by Analytics, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *AnalyticsLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("analytics.json")
+}
@@ -29,3 +29,9 @@ func NewConversationsLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Con
 func (l *ConversationsLogic) Conversations() (resp *types.ConversationsResponse, err error) {
 	return l.svcCtx.DataLoader.LoadConversations()
 }
+
+// ETag identifies the version of the data served by Conversations, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *ConversationsLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("conversations.json")
+}
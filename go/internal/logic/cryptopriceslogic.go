@@ -29,3 +29,9 @@ func NewCryptoPricesLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Cryp
 func (l *CryptoPricesLogic) CryptoPrices() (resp *types.CryptoPricesResponse, err error) {
 	return l.svcCtx.DataLoader.LoadCryptoPrices()
 }
+
+// ETag identifies the version of the data served by CryptoPrices, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *CryptoPricesLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("crypto-prices.json")
+}
@@ -29,3 +29,9 @@ func NewLeaderboardLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Leade
 func (l *LeaderboardLogic) Leaderboard() (resp *types.LeaderboardResponse, err error) {
 	return l.svcCtx.DataLoader.LoadLeaderboard()
 }
+
+// ETag identifies the version of the data served by Leaderboard, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *LeaderboardLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("leaderboard.json")
+}
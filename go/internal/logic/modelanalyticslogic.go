@@ -29,3 +29,9 @@ func NewModelAnalyticsLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Mo
 func (l *ModelAnalyticsLogic) ModelAnalytics(modelId string) (resp *types.ModelAnalyticsResponse, err error) {
 	return l.svcCtx.DataLoader.LoadModelAnalytics(modelId)
 }
+
+// ETag identifies the version of the data served by ModelAnalytics for modelId, so
+// unchanged responses can be answered with 304 Not Modified without loading them.
+func (l *ModelAnalyticsLogic) ETag(modelId string) (string, error) {
+	return l.svcCtx.DataLoader.ModelAnalyticsETag(modelId)
+}
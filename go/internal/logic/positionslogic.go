@@ -29,3 +29,9 @@ func NewPositionsLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Positio
 func (l *PositionsLogic) Positions(req *types.PositionsRequest) (resp *types.PositionsResponse, err error) {
 	return l.svcCtx.DataLoader.LoadPositions()
 }
+
+// ETag identifies the version of the data served by Positions, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *PositionsLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("positions.json")
+}
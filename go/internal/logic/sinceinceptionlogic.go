@@ -29,3 +29,9 @@ func NewSinceInceptionLogic(ctx context.Context, svcCtx *svc.ServiceContext) *Si
 func (l *SinceInceptionLogic) SinceInception() (resp *types.SinceInceptionResponse, err error) {
 	return l.svcCtx.DataLoader.LoadSinceInception()
 }
+
+// ETag identifies the version of the data served by SinceInception, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *SinceInceptionLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("since-inception-values.json")
+}
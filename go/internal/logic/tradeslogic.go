@@ -29,3 +29,9 @@ func NewTradesLogic(ctx context.Context, svcCtx *svc.ServiceContext) *TradesLogi
 func (l *TradesLogic) Trades() (resp *types.TradesResponse, err error) {
 	return l.svcCtx.DataLoader.LoadTrades()
 }
+
+// ETag identifies the version of the data served by Trades, so unchanged
+// responses can be answered with 304 Not Modified without loading them.
+func (l *TradesLogic) ETag() (string, error) {
+	return l.svcCtx.DataLoader.ETag("trades.json")
+}
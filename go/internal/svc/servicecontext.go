@@ -1,6 +1,7 @@
 package svc
 
 import (
+	"context"
 	"database/sql"
 	"log"
 	"strings"
@@ -68,8 +69,12 @@ type ServiceContext struct {
 
 func NewServiceContext(c config.Config, mainConfigPath string) *ServiceContext {
 	svc := &ServiceContext{
-		Config:     c,
-		DataLoader: data.NewDataLoader(c.DataPath),
+		Config: c,
+		DataLoader: data.NewDataLoaderWithTTL(c.DataPath, data.CacheTTL{
+			Short:  time.Duration(c.TTL.Short) * time.Second,
+			Medium: time.Duration(c.TTL.Medium) * time.Second,
+			Long:   time.Duration(c.TTL.Long) * time.Second,
+		}),
 	}
 
 	cacheNodes := filterCacheNodes(c.Cache)
@@ -91,6 +96,7 @@ func NewServiceContext(c config.Config, mainConfigPath string) *ServiceContext {
 			log.Fatalf("failed to init postgres raw db: %v", err)
 		}
 		applyPostgresPool(raw, c.Postgres)
+		go warmPostgresPool(raw, c.Postgres)
 		svc.DBConn = conn
 		if svc.Cache != nil {
 			cached := sqlc.NewConnWithCache(conn, svc.Cache)
@@ -279,6 +285,39 @@ func applyPostgresPool(db *sql.DB, cfg config.PostgresConf) {
 	}
 }
 
+// warmPostgresPool opens a couple of idle connections so the first requests do
+// not pay for dialing and authentication. It runs in the background at startup;
+// failures only log, and the pool still dials on demand.
+func warmPostgresPool(db *sql.DB, cfg config.PostgresConf) {
+	n := 2 // database/sql keeps two idle connections unless configured otherwise
+	if cfg.MaxOpen > 0 && cfg.MaxOpen < n {
+		n = cfg.MaxOpen
+	}
+	if cfg.MaxIdle > 0 && cfg.MaxIdle < n {
+		n = cfg.MaxIdle
+	}
+
+	ctx, cancel := context.WithTimeout(context.Background(), 5*time.Second)
+	defer cancel()
+	conns := make([]*sql.Conn, 0, n)
+	defer func() {
+		for _, conn := range conns {
+			_ = conn.Close()
+		}
+	}()
+	for i := 0; i < n; i++ {
+		conn, err := db.Conn(ctx)
+		if err == nil {
+			conns = append(conns, conn)
+			err = conn.PingContext(ctx)
+		}
+		if err != nil {
+			log.Printf("postgres pool warm-up stopped after %d connections: %v", i, err)
+			return
+		}
+	}
+}
+
 func filterCacheNodes(conf cache.CacheConf) cache.CacheConf {
 	nodes := make(cache.CacheConf, 0, len(conf))
 	for _, node := range conf {
@@ -20,14 +20,21 @@ import subprocess
 import sys
 import os
 import signal
+import socket
 import time
 import argparse
+import errno
+import atexit
+import json
+import re
+import selectors
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 import tempfile
-import psutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 # ANSI color codes for terminal output
 COLORS = {
@@ -38,6 +45,21 @@ COLORS = {
     "NC": "\033[0m",  # No Color
 }
 
+# Per-package summary lines printed by `go test`, e.g. "ok  \tnof0-api/pkg/llm\t0.1s"
+GO_TEST_RESULT = re.compile(r"^(ok|FAIL)\s+(\S+)")
+
+# Keep-alive session shared by every HTTP probe against the local server
+_SESSION = requests.Session()
+_SESSION.mount(
+    "http://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+)
+atexit.register(_SESSION.close)
+
+# Discovery results shared between runs, validated against directory mtimes
+TEST_DISCOVERY_CACHE = os.path.join(
+    tempfile.gettempdir(), ".cache", "nof0-testpkgs.json"
+)
+
 
 def print_colored(message: str, color: str = "NC"):
     """Print a message with ANSI color codes."""
@@ -75,22 +97,99 @@ def run_command(
         return "", str(e), 1
 
 
+def run_command_stream(command: List[str], cwd: str = None, on_line=None) -> int:
+    """
+    Run a command, writing its output to stdout line by line as it arrives.
+
+    Args:
+        command: Command to execute as a list of strings
+        cwd: Working directory for the command
+        on_line: Optional callback invoked with every output line
+
+    Returns:
+        The command's return code
+    """
+    try:
+        with subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True,
+            errors="replace",
+        ) as proc:
+            for line in proc.stdout:
+                sys.stdout.write(line)
+                if on_line:
+                    on_line(line)
+            return proc.wait()
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+
+def go_module_path() -> str:
+    """Return the module path declared in go.mod."""
+    with open("go.mod") as f:
+        for line in f:
+            if line.startswith("module "):
+                return line.split()[1]
+    return ""
+
+
+def run_go_test_packages(flags: List[str], packages: List[str], kind: str) -> bool:
+    """
+    Run `go test` once over all packages and report a result per package.
+
+    Args:
+        flags: Flags passed to `go test`
+        packages: Package patterns such as ./pkg/llm or ./internal/...
+        kind: Test kind used in the report, e.g. "unit"
+
+    Returns:
+        True if every package passed
+    """
+    results = {}
+
+    def collect(line: str):
+        match = GO_TEST_RESULT.match(line)
+        if match:
+            results[match.group(2)] = match.group(1) == "ok"
+
+    code = run_command_stream(["go", "test", *flags, *packages], on_line=collect)
+    print()
+
+    module = go_module_path()
+    success = code == 0
+    for package in packages:
+        recursive = package.endswith("/...")
+        import_path = module + package[1:].replace("/...", "")
+        outcomes = [
+            ok
+            for name, ok in results.items()
+            if name == import_path or (recursive and name.startswith(import_path + "/"))
+        ]
+        if all(outcomes) and (outcomes or code == 0):
+            print_colored(f"✓ {package} {kind} tests passed", "GREEN")
+        else:
+            print_colored(f"✗ {package} {kind} tests failed", "RED")
+            success = False
+
+    print()
+    return success
+
+
 def check_server_running(port: int = 8888) -> bool:
     """Check if a server is already running on the specified port."""
-    try:
-        for proc in psutil.process_iter(["pid", "name"]):
-            try:
-                connections = proc.connections()
-                for conn in connections:
-                    if conn.laddr.port == port and conn.status == "LISTEN":
-                        return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return False
-    except Exception:
-        # Fallback to using netstat if psutil is not available
-        stdout, _, _ = run_command(["netstat", "-an"], shell=True)
-        return f":{port}" in stdout
+    stdout, _, code = run_command(["ss", "-ltnH", f"sport = :{port}"])
+    if code == 0:
+        return bool(stdout.strip())
+
+    # Fallback to a TCP connect probe where `ss` is unavailable (e.g. macOS)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
 
 
 def start_server() -> Optional[int]:
@@ -120,49 +219,180 @@ def start_server() -> Optional[int]:
         return None
 
 
-def wait_for_server(timeout: int = 30) -> bool:
+def _port_accepting(port: int, timeout: float) -> bool:
+    """
+    Attempt a non-blocking connect and wait for the kernel to report its outcome.
+
+    The selector wakes up as soon as the handshake completes or fails, instead
+    of on a fixed polling tick.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setblocking(False)
+        code = sock.connect_ex(("127.0.0.1", port))
+        if code == 0:
+            return True
+        if code not in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            return False
+
+        with selectors.DefaultSelector() as sel:
+            sel.register(sock, selectors.EVENT_WRITE)
+            if not sel.select(timeout=timeout):
+                return False
+        return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+
+
+def wait_for_server(timeout: int = 30, port: int = 8888) -> bool:
     """Wait for the server to be ready to accept requests."""
     print("Waiting for server to be ready...", end="")
 
-    for i in range(timeout):
-        try:
-            response = requests.get(
-                "http://localhost:8888/api/crypto-prices", timeout=5
-            )
-            if response.status_code == 200:
-                print_colored(" ✓ Server ready", "GREEN")
-                return True
-        except requests.exceptions.RequestException:
-            pass
+    deadline = time.monotonic() + timeout
+    next_dot = time.monotonic() + 1
+    backoff = 0.025
 
-        time.sleep(1)
-        print(".", end="", flush=True)
+    while time.monotonic() < deadline:
+        if _port_accepting(port, min(1.0, max(0.0, deadline - time.monotonic()))):
+            # Port accepts connections; confirm the framework is serving
+            try:
+                response = _SESSION.get(
+                    f"http://localhost:{port}/api/crypto-prices", timeout=5
+                )
+                if response.status_code == 200:
+                    print_colored(" ✓ Server ready", "GREEN")
+                    return True
+            except requests.exceptions.RequestException:
+                pass
+
+        time.sleep(backoff)
+        backoff = min(0.2, backoff * 1.5)
+        if time.monotonic() >= next_dot:
+            next_dot += 1
+            print(".", end="", flush=True)
 
     print_colored(" ✗ Server failed to start within timeout", "RED")
     return False
 
 
+def _wait_for_exit(pid: int, timeout: float) -> bool:
+    """Wait for a process to exit, reaping it if it is our child."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            exited, _ = os.waitpid(pid, os.WNOHANG)
+            if exited:
+                return True
+        except ChildProcessError:
+            # Not our child (or already reaped); probe the pid instead
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+        time.sleep(0.05)
+    return False
+
+
 def stop_server(pid: int):
     """Stop the server process."""
     if pid:
         print_colored("Stopping server...", "BLUE")
         try:
-            process = psutil.Process(pid)
-            process.terminate()
-            process.wait(timeout=5)
-            print_colored("✓ Server stopped", "GREEN")
-        except psutil.NoSuchProcess:
+            os.kill(pid, signal.SIGTERM)
+            if _wait_for_exit(pid, timeout=5):
+                print_colored("✓ Server stopped", "GREEN")
+                return
+            os.kill(pid, signal.SIGKILL)
+            _wait_for_exit(pid, timeout=5)
+            print_colored("✓ Server killed", "GREEN")
+        except ProcessLookupError:
             pass
-        except psutil.TimeoutExpired:
-            try:
-                process.kill()
-                print_colored("✓ Server killed", "GREEN")
-            except psutil.NoSuchProcess:
-                pass
         except Exception as e:
             print_colored(f"Error stopping server: {e}", "RED")
 
 
+def _load_discovery_cache() -> dict:
+    """Load cached test discovery results, or an empty cache."""
+    try:
+        with open(TEST_DISCOVERY_CACHE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_discovery_cache(cache: dict):
+    """Persist test discovery results; failures only cost a rescan next run."""
+    try:
+        os.makedirs(os.path.dirname(TEST_DISCOVERY_CACHE), exist_ok=True)
+        with open(TEST_DISCOVERY_CACHE, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def _dirs_unchanged(dirs: dict) -> bool:
+    """Check that none of the recorded directories changed since the scan."""
+    try:
+        return all(os.stat(d).st_mtime_ns == mtime for d, mtime in dirs.items())
+    except OSError:
+        return False
+
+
+def _has_test(
+    path: str, suffix: str, exclude_suffix: str = None, visited: dict = None
+) -> Tuple[bool, int]:
+    """
+    Check whether a directory tree contains a test file, stopping at the first hit.
+
+    Args:
+        path: Directory to scan recursively
+        suffix: File name suffix that marks a test file
+        exclude_suffix: Optional suffix of files to skip
+        visited: Optional dict filled with {directory: mtime_ns} for every
+            directory read before returning
+
+    Returns:
+        Tuple of (found, directories_scanned)
+    """
+    stack = [path]
+    scanned = 0
+    while stack:
+        current = stack.pop()
+        if visited is not None:
+            visited[os.path.abspath(current)] = os.stat(current).st_mtime_ns
+        scanned += 1
+        with os.scandir(current) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(suffix) and not (
+                    exclude_suffix and name.endswith(exclude_suffix)
+                ):
+                    if entry.is_file(follow_symlinks=False):
+                        return True, scanned
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return False, scanned
+
+
+def _contains_tests(
+    path: str, suffix: str, exclude_suffix: str = None, cache: dict = None
+) -> bool:
+    """
+    Check whether a directory tree contains test files, reusing a cached
+    answer when none of the directories read by the previous scan changed.
+    """
+    if cache is None:
+        return _has_test(path, suffix, exclude_suffix)[0]
+
+    key = f"{suffix}|{exclude_suffix or ''}|{os.path.abspath(path)}"
+    entry = cache.get(key)
+    if entry and "found" in entry and _dirs_unchanged(entry["dirs"]):
+        return entry["found"]
+
+    dirs = {}
+    found, _ = _has_test(path, suffix, exclude_suffix, visited=dirs)
+    cache[key] = {"found": found, "dirs": dirs}
+    return found
+
+
 def discover_test_packages() -> List[str]:
     """Discover all Go packages that contain unit tests."""
     print_colored("Discovering test packages...", "BLUE")
@@ -183,6 +413,7 @@ def discover_test_packages() -> List[str]:
     ]
 
     test_packages = []
+    cache = _load_discovery_cache()
 
     for dir_pattern in potential_dirs:
         # Remove ... suffix for directory check
@@ -191,23 +422,19 @@ def discover_test_packages() -> List[str]:
             continue
 
         # Look for test files in the directory
-        test_files = []
         try:
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    if file.endswith("_test.go") and not file.endswith(
-                        "_integration_test.go"
-                    ):
-                        test_files.append(os.path.join(root, file))
+            has_tests = _contains_tests(
+                dir_path, "_test.go", "_integration_test.go", cache
+            )
         except Exception as e:
             print_colored(f"Error scanning {dir_path}: {e}", "YELLOW")
             continue
 
-        if test_files:
+        if has_tests:
             # Use Go package path
             package_path = dir_pattern
             print_colored(
-                f"✓ Found unit tests in {package_path}: {len(test_files)} files",
+                f"✓ Found unit tests in {package_path}",
                 "GREEN",
             )
             test_packages.append(dir_pattern)
@@ -216,6 +443,7 @@ def discover_test_packages() -> List[str]:
                 f"✗ No unit tests found in {dir_path.replace('./', '')}", "RED"
             )
 
+    _save_discovery_cache(cache)
     print()
     return test_packages
 
@@ -225,8 +453,6 @@ def run_unit_tests() -> bool:
     print_colored("Running unit tests with auto-discovery...", "YELLOW")
     print()
 
-    success = True
-
     # Discover test packages
     test_packages = discover_test_packages()
 
@@ -234,28 +460,9 @@ def run_unit_tests() -> bool:
         print_colored("No test packages found", "YELLOW")
         return True
 
-    # Run tests for discovered packages
-    for package in test_packages:
-        print_colored(f"Running unit tests for {package}...", "BLUE")
-
-        stdout, stderr, code = run_command(
-            ["go", "test", "-tags=dotenv", package, "-v"]
-        )
-
-        if code == 0:
-            print_colored(f"✓ {package} unit tests passed", "GREEN")
-        else:
-            print_colored(f"✗ {package} unit tests failed", "RED")
-            success = False
-
-        if stdout:
-            print(stdout)
-        if stderr:
-            print(stderr, file=sys.stderr)
-
-        print()
-
-    return success
+    # Run all discovered packages in a single go test invocation
+    print_colored(f"Running unit tests for {', '.join(test_packages)}...", "BLUE")
+    return run_go_test_packages(["-tags=dotenv", "-v"], test_packages, "unit")
 
 
 def run_benchmarks():
@@ -286,32 +493,67 @@ def run_benchmarks():
         print(stderr, file=sys.stderr)
 
 
-def generate_coverage():
+def coverage_percent(profile: str) -> Optional[float]:
+    """
+    Compute total statement coverage from a Go coverage profile.
+
+    Equivalent to the "total:" line of `go tool cover -func`, without
+    spawning the tool. Each profile line is "file:start,end stmts count";
+    blocks listed more than once count as covered if any entry is.
+
+    Returns:
+        Coverage percentage, or None if the profile has no statements
+    """
+    blocks = {}
+    with open(profile) as f:
+        for line in f:
+            if line.startswith("mode:"):
+                continue
+            fields = line.split()
+            if len(fields) != 3:
+                continue
+            block, stmts, count = fields
+            covered = count != "0"
+            blocks[block] = (int(stmts), covered or blocks.get(block, (0, False))[1])
+
+    total = sum(stmts for stmts, _ in blocks.values())
+    if total == 0:
+        return None
+    covered = sum(stmts for stmts, hit in blocks.values() if hit)
+    return 100 * covered / total
+
+
+def generate_coverage(html: bool = False):
     """Generate test coverage report."""
     print_colored("Generating coverage report...", "YELLOW")
     print()
 
     # Generate coverage file
-    stdout, stderr, _ = run_command(
+    _, stderr, _ = run_command(
         ["go", "test", "-tags=dotenv", "./internal/...", "-coverprofile=coverage.out"]
     )
 
     # Extract coverage percentage
     if os.path.exists("coverage.out"):
-        stdout, stderr, _ = run_command(["go", "tool", "cover", "-func=coverage.out"])
-        if stdout:
-            for line in stdout.split("\n"):
-                if "total:" in line:
-                    coverage = line.split()[-1]
-                    print_colored(f"Total Coverage: {coverage}", "GREEN")
-                    break
+        coverage = coverage_percent("coverage.out")
+        if coverage is not None:
+            print_colored(f"Total Coverage: {coverage:.1f}%", "GREEN")
 
     if stderr:
         print(stderr, file=sys.stderr)
 
     print()
     print("Coverage report: coverage.out")
-    print("View HTML report: go tool cover -html=coverage.out")
+    if html and os.path.exists("coverage.out"):
+        _, stderr, code = run_command(
+            ["go", "tool", "cover", "-html=coverage.out", "-o", "coverage.html"]
+        )
+        if code == 0:
+            print("HTML report: coverage.html")
+        elif stderr:
+            print(stderr, file=sys.stderr)
+    else:
+        print("View HTML report: go tool cover -html=coverage.out")
 
 
 def discover_integration_test_packages() -> List[str]:
@@ -330,6 +572,7 @@ def discover_integration_test_packages() -> List[str]:
     ]
 
     integration_packages = []
+    cache = _load_discovery_cache()
 
     for dir_path in potential_dirs:
         # Check if directory exists
@@ -337,21 +580,17 @@ def discover_integration_test_packages() -> List[str]:
             continue
 
         # Look for integration test files in the directory
-        integration_test_files = []
         try:
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    if file.endswith("_integration_test.go"):
-                        integration_test_files.append(os.path.join(root, file))
+            has_tests = _contains_tests(dir_path, "_integration_test.go", cache=cache)
         except Exception as e:
             print_colored(f"Error scanning {dir_path}: {e}", "YELLOW")
             continue
 
-        if integration_test_files:
+        if has_tests:
             # Use Go package path (replace slashes with dots for display)
             package_path = dir_path.replace("./", "").replace("/", ".")
             print_colored(
-                f"✓ Found integration tests in {package_path}: {len(integration_test_files)} files",
+                f"✓ Found integration tests in {package_path}",
                 "GREEN",
             )
             integration_packages.append(dir_path)
@@ -360,6 +599,7 @@ def discover_integration_test_packages() -> List[str]:
                 f"✗ No integration tests found in {dir_path.replace('./', '')}", "RED"
             )
 
+    _save_discovery_cache(cache)
     print()
     return integration_packages
 
@@ -369,8 +609,6 @@ def run_integration_tests() -> bool:
     print_colored("Running integration tests with auto-discovery...", "YELLOW")
     print()
 
-    success = True
-
     # Discover integration test packages
     integration_packages = discover_integration_test_packages()
 
@@ -378,53 +616,21 @@ def run_integration_tests() -> bool:
         print_colored("No integration test packages found", "YELLOW")
         return True
 
-    # Run integration tests for discovered packages
-    for package in integration_packages:
-        print_colored(f"Running integration tests for {package}...", "BLUE")
-
-        stdout, stderr, code = run_command(
-            [
-                "go",
-                "test",
-                "-tags=dotenv integration",
-                package,
-                "-v",
-                "-run",
-                "Integration",
-            ]
-        )
-
-        if code == 0:
-            print_colored(f"✓ {package} integration tests passed", "GREEN")
-        else:
-            print_colored(f"✗ {package} integration tests failed", "RED")
-            success = False
-
-        if stdout:
-            print(stdout)
-        if stderr:
-            print(stderr, file=sys.stderr)
-
-        print()
+    # Run all discovered packages in a single go test invocation
+    print_colored(
+        f"Running integration tests for {', '.join(integration_packages)}...", "BLUE"
+    )
+    success = run_go_test_packages(
+        ["-tags=dotenv integration", "-v", "-run", "Integration"],
+        integration_packages,
+        "integration",
+    )
 
     # Run API integration tests separately (they might have different tag requirements)
     print_colored("Running API integration tests...", "BLUE")
-    stdout, stderr, code = run_command(
-        ["go", "test", "-tags=dotenv", "./test/...", "-v"]
-    )
-
-    if code == 0:
-        print_colored("✓ API integration tests passed", "GREEN")
-    else:
-        print_colored("✗ API integration tests failed", "RED")
+    if not run_go_test_packages(["-tags=dotenv", "-v"], ["./test/..."], "API"):
         success = False
 
-    if stdout:
-        print(stdout)
-    if stderr:
-        print(stderr, file=sys.stderr)
-
-    print()
     return success
 
 
@@ -445,17 +651,21 @@ def test_endpoints() -> bool:
 
     all_passed = True
 
-    for endpoint, name in endpoints:
-        print(f"Testing {name}... ", end="", flush=True)
-
+    def probe(endpoint: str) -> bool:
         try:
-            response = requests.get(f"http://localhost:8888/api/{endpoint}", timeout=5)
-            if response.status_code == 200:
-                print_colored("✓", "GREEN")
-            else:
-                print_colored("✗", "RED")
-                all_passed = False
+            response = _SESSION.get(f"http://localhost:8888/api/{endpoint}", timeout=5)
+            return response.status_code == 200
         except requests.exceptions.RequestException:
+            return False
+
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        results = list(executor.map(probe, [endpoint for endpoint, _ in endpoints]))
+
+    for (_, name), passed in zip(endpoints, results):
+        print(f"Testing {name}... ", end="", flush=True)
+        if passed:
+            print_colored("✓", "GREEN")
+        else:
             print_colored("✗", "RED")
             all_passed = False
 
@@ -470,7 +680,7 @@ def show_server_log():
             print(f.read())
 
 
-def run_all_tests() -> int:
+def run_all_tests(coverage_html: bool = False) -> int:
     """Run all tests and return exit code."""
     print_colored("================================", "NC")
     print_colored("NOF0 API Test Suite", "NC")
@@ -487,7 +697,7 @@ def run_all_tests() -> int:
     run_benchmarks()
 
     # Generate coverage
-    generate_coverage()
+    generate_coverage(html=coverage_html)
 
     print()
     print_colored("=========================================", "NC")
@@ -551,6 +761,11 @@ def main():
         action="store_true",
         help="Skip server startup for integration tests",
     )
+    parser.add_argument(
+        "--coverage-html",
+        action="store_true",
+        help="Also render the coverage profile to coverage.html",
+    )
 
     args = parser.parse_args()
 
@@ -563,7 +778,7 @@ def main():
             print_colored("Running unit tests only...", "NC")
             success = run_unit_tests()
             run_benchmarks()
-            generate_coverage()
+            generate_coverage(html=args.coverage_html)
             return 0 if success else 1
 
         elif args.test_type == "integration":
@@ -585,7 +800,7 @@ def main():
                     stop_server(server_pid)
 
         else:  # 'all'
-            return run_all_tests()
+            return run_all_tests(coverage_html=args.coverage_html)
 
     except KeyboardInterrupt:
         print_colored("\nTest execution interrupted", "YELLOW")